@@ -33,26 +33,55 @@ processes per machine for a total of 16 cores, use:
 
     $ runcirrus -q bigmem -n 8 -m 2 spe1.in
 
+Several input files may be given at once. On a queue these are submitted
+together as a single array job, and locally they are run one after another, or
+'-P' (aka. '--parallel') at a time:
+
+    $ runcirrus -P 2 spe1.in spe2.in spe3.in
+
 """
 
 from __future__ import annotations
 import sys
 from typing import Any, NoReturn
+import logging
 import os
-import argparse
-import shutil
-import shlex
 import re
 import subprocess
 from pathlib import Path
 from dataclasses import dataclass
+from functools import cache
 from runcirrus.logger import logger
 
 
-SCRIPT = """\
+SCRIPT_HEADER = """\
 #!/usr/bin/bash
 set -e -o pipefail
+"""
+
+
+@dataclass
+class Job:
+    """A single Cirrus case to run"""
+
+    root: Path
+    input_file: Path
+    outdir: Path
+    progname: str
+    num_tasks: int
+    mpi_args: str
+    cirrus_args: str
+    telemetry: str | None
 
+    @property
+    def case(self) -> str:
+        return self.input_file.stem
+
+
+def case_script(job: Job) -> str:
+    """Job script commands for running a single Cirrus case"""
+    root, outdir, case, progname = job.root, job.outdir, job.case, job.progname
+    return f"""\
 cd "{outdir}"
 
 arg_mpi_transport=
@@ -70,18 +99,122 @@ then
     arg_mpi_transport="-mca btl vader,self,tcp -mca pml ^ucx"
 fi
 
-({root}/bin/mpirun $arg_mpi_transport $arg_machinefile {num_tasks} {mpi_args} {telemetry} {root}/bin/{progname} {cirrus_args} -{progname}in "{input_file}" -output_prefix "{outdir}/{case}" | tee "{outdir}/{case}.LOG") 3>&1 1>&2 2>&3 | tee "{outdir}/{case}.ERR"
+({root}/bin/mpirun $arg_mpi_transport $arg_machinefile -np {job.num_tasks} {job.mpi_args} {job.telemetry} {root}/bin/{progname} {job.cirrus_args} -{progname}in "{job.input_file}" -output_prefix "{outdir}/{case}" | tee "{outdir}/{case}.LOG") 3>&1 1>&2 2>&3 | tee "{outdir}/{case}.ERR"
 """
 
 
-HAVE_BSUB = shutil.which("bsub") is not None  # IBM LSF
-HAVE_QSUB = shutil.which("qsub") is not None  # OpenPBS
+def mpirun_command(job: Job) -> list[str] | None:
+    """The mpirun command line of case_script(), for running it without bash
+
+    This performs the job script's machinefile and RDMA transport checks on the
+    current machine. The user-supplied arguments are only split on whitespace
+    and quotes. If they need anything else from the shell, such as variable,
+    tilde or command substitution expansion, None is returned instead.
+    """
+    user_args = [
+        _plain_words(args)
+        for args in (job.mpi_args, job.telemetry or "", job.cirrus_args)
+    ]
+    mpi_args, telemetry, cirrus_args = user_args
+    if mpi_args is None or telemetry is None or cirrus_args is None:
+        return None
+
+    transport_args = []
+    if re.search(r"\bbnxt_re\b", _read_text("/proc/modules")):
+        # Possibly non-working RDMA transport
+        transport_args = ["-mca", "btl", "vader,self,tcp", "-mca", "pml", "^ucx"]
+
+    machinefile_args = []
+    if os.environ.get("LSB_MCPU_HOSTS"):  # LSF
+        if rankfile := os.environ.get("LSB_DJOB_RANKFILE"):
+            machinefile_args = ["-machinefile", rankfile]
+    elif os.environ.get("PBS_NODEFILE"):  # PBS
+        machinefile_args = ["-machinefile", os.environ["PBS_NODEFILE"]]
+
+    return [
+        f"{job.root}/bin/mpirun",
+        *transport_args,
+        *machinefile_args,
+        "-np",
+        str(job.num_tasks),
+        *mpi_args,
+        *telemetry,
+        f"{job.root}/bin/{job.progname}",
+        *cirrus_args,
+        f"-{job.progname}in",
+        str(job.input_file),
+        "-output_prefix",
+        f"{job.outdir}/{job.case}",
+    ]
+
+
+# Arguments made only of these characters mean the same to shlex.split as to
+# bash, as they contain no expansions, escapes or other shell syntax
+_PLAIN_ARGS_RE = re.compile(r"[\w\s'\"=.,:/@%+^-]*")
+
+
+def _plain_words(text: str) -> list[str] | None:
+    """Split text into words if bash would do so without any expansion
+
+    Returns None when text uses shell syntax other than whitespace and
+    quotes, such as '$', '~', backticks or backslashes, or has unbalanced
+    quotes. bash is then needed to interpret it like the job script does.
+    """
+    import shlex
+
+    if not _PLAIN_ARGS_RE.fullmatch(text):
+        return None
+    try:
+        return shlex.split(text)
+    except ValueError:
+        return None
+
+
+def _read_text(path: str) -> str:
+    try:
+        return Path(path).read_text()
+    except OSError:
+        return ""
+
+
+# Legacy spellings of -m/--num-machines and -n/--num-tasks-per-machine
+_ARG_REMAP = {"-nn": "-m", "-nm": "-n"}
+
+_VERSION_RE = re.compile(r"^run(cirrus|pflotran)(\d+(?:\.\d+)*)?")
+_LEADING_DIGITS_RE = re.compile(r"\d+")
+
+
+@cache
+def _detect_schedulers() -> tuple[bool, bool]:
+    """Look for bsub (IBM LSF) and qsub (OpenPBS) in a single pass over PATH"""
+    have_bsub = have_qsub = False
+    for directory in os.environ.get("PATH", os.defpath).split(os.pathsep):
+        if not directory:
+            continue
+        if not have_bsub:
+            have_bsub = _is_executable(os.path.join(directory, "bsub"))
+        if not have_qsub:
+            have_qsub = _is_executable(os.path.join(directory, "qsub"))
+        if have_bsub and have_qsub:
+            break
+    return have_bsub, have_qsub
+
+
+def _is_executable(path: str) -> bool:
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _have_bsub() -> bool:
+    return _detect_schedulers()[0]
+
+
+def _have_qsub() -> bool:
+    return _detect_schedulers()[1]
 
 
 def default_version(script_name: str) -> str:
     """Determine the default version from script name"""
-    p = re.compile(r"^run(cirrus|pflotran)(\d+(?:\.\d+)*)?")
-    if (m := p.match(script_name)) is None:
+    if (m := _VERSION_RE.match(script_name)) is None:
         return "stable"
     if v := m.group(2):
         return v
@@ -90,6 +223,22 @@ def default_version(script_name: str) -> str:
     return "stable"
 
 
+@cache
+def _version_tuple(version: str) -> tuple[int, ...]:
+    """Numeric components of a version string, eg. (1, 10) for "1.10-openpbs"
+
+    Each component contributes its leading digits, and parsing stops at the
+    first component without any, so named versions like "stable" give an
+    empty tuple.
+    """
+    numbers = []
+    for component in version.split("."):
+        if (m := _LEADING_DIGITS_RE.match(component)) is None:
+            break
+        numbers.append(int(m.group()))
+    return tuple(numbers)
+
+
 def ensure_local_on_hpc(args: Arguments) -> None:
     """
     If we're running on the cluster alrea, override queue to local and set
@@ -120,6 +269,7 @@ def get_max_allowed_cpu(requested: int | None = None) -> int:
     return min(machine_max, requested or machine_max)
 
 
+@cache
 def get_versions_path() -> Path:
     """Get directory path of install cirrus versions
 
@@ -130,41 +280,33 @@ def get_versions_path() -> Path:
     if (path := os.environ.get("CIRRUS_VERSIONS_PATH")) is not None:
         return Path(path).expanduser()
 
-    search_path = Path(os.path.dirname(__file__)).resolve()
-
-    while search_path.name != "versions":
-        search_path = search_path.parent
-
-        if search_path.parent == search_path:
-            # Hit root
-            raise RuntimeError(
-                f"Not able to locate install location from {Path(os.path.dirname(__file__))}"
-            )
-
-    return search_path
+    parts = Path(os.path.dirname(__file__)).resolve().parts
+    try:
+        # Innermost "versions" directory, as if walking up the tree
+        index = len(parts) - 1 - parts[::-1].index("versions")
+    except ValueError:
+        raise RuntimeError(
+            f"Not able to locate install location from {Path(os.path.dirname(__file__))}"
+        ) from None
 
+    return Path(*parts[: index + 1])
 
-class PrintVersionAction(argparse.Action):
-    def __call__(self, *_args: Any) -> None:
-        possible_versions = []
 
-        for fpath in os.listdir(get_versions_path()):
-            if fpath.startswith("."):
-                continue
+def _print_versions() -> NoReturn:
+    with os.scandir(get_versions_path()) as it:
+        possible_versions = [e.name for e in it if not e.name.startswith(".")]
 
-            possible_versions.append(fpath)
-
-        if not possible_versions:
-            print(f"No installed versions found at {get_versions_path()}")
-        else:
-            print("\n".join(possible_versions))
+    if not possible_versions:
+        print(f"No installed versions found at {get_versions_path()}")
+    else:
+        sys.stdout.write("\n".join(possible_versions) + "\n")
 
-        sys.exit()
+    sys.exit()
 
 
 @dataclass
 class Arguments:
-    input: str
+    input: list[str]
     queue: str
     num_tasks_per_machine: int
     num_machines: int
@@ -180,102 +322,337 @@ class Arguments:
     bsub_args: str | None = None
     qsub_args: str | None = None
     exclusive: bool | None = None
+    parallel: int = 1
 
 
-def parse_args(argv: list[str]) -> Arguments:
-    ap = argparse.ArgumentParser(
-        prog="runcirrus",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=__doc__,
-    )
-    ap.add_argument("input", help="Cirrus .in input file")
-    ap.add_argument(
-        "-q", "--queue", default="local", help="Job queue, or 'local' to run locally"
-    )
-    ap.add_argument(
-        "-n",
-        "--num-tasks-per-machine",
-        type=int,
-        help="Number of tasks/processes per machine",
-    )
-    ap.add_argument(
-        "-m",
-        "--num-machines",
+@dataclass(frozen=True)
+class Option:
+    """Command-line option accepted by runcirrus
+
+    A 'type' of None marks a flag which takes no value and sets 'dest' to True,
+    and otherwise defaults to False.
+    """
+
+    dest: str
+    flags: tuple[str, ...]
+    help: str
+    type: type[int] | type[str] | None = str
+    default: Any = None
+
+
+OPTIONS = (
+    Option(
+        "queue",
+        ("-q", "--queue"),
+        "Job queue, or 'local' to run locally",
+        default="local",
+    ),
+    Option(
+        "num_tasks_per_machine",
+        ("-n", "--num-tasks-per-machine"),
+        "Number of tasks/processes per machine",
+        int,
+    ),
+    Option(
+        "num_machines",
+        ("-m", "--num-machines"),
+        "Number of machines (nodes)",
+        int,
         default=1,
-        type=int,
-        help="Number of machines (nodes)",
-    )
-    ap.add_argument("-i", "--interactive", action="store_true", help="Run locally")
-    ap.add_argument(
-        "-v",
-        "--version",
-        help="Version of Cirrus to use",
-    )
-    ap.add_argument(
-        "-o",
-        "--output-directory",
-        help="Directory to store the output to",
-    )
-    ap.add_argument(
-        "--cirrus-args",
-        help="Additional arguments for Cirrus",
-    )
-    ap.add_argument(
-        "--mpi-args",
-        help="Additional arguments for mpirun command",
-    )
-    ap.add_argument(
-        "--telemetry",
-        type=str,
+    ),
+    Option("interactive", ("-i", "--interactive"), "Run locally", None),
+    Option("version", ("-v", "--version"), "Version of Cirrus to use"),
+    Option(
+        "output_directory",
+        ("-o", "--output-directory"),
+        "Directory to store the output to",
+    ),
+    Option("cirrus_args", ("--cirrus-args",), "Additional arguments for Cirrus"),
+    Option("mpi_args", ("--mpi-args",), "Additional arguments for mpirun command"),
+    Option(
+        "telemetry",
+        ("--telemetry",),
+        "Program to run between mpirun and Cirrus",
         default="",
-        help="Program to run between mpirun and Cirrus",
-    )
-    if HAVE_BSUB:
-        ap.add_argument("--bsub-args", help="Additional arguments for bsub command")
-    if HAVE_QSUB:
-        ap.add_argument("--qsub-args", help="Additional arguments for qsub command")
-        ap.add_argument(
-            "-e", "--exclusive", help="Exclusive node usage [default: shared]"
+    ),
+    Option(
+        "parallel",
+        ("-P", "--parallel"),
+        "Number of input files to run at once when running locally",
+        int,
+        default=1,
+    ),
+    Option("bsub_args", ("--bsub-args",), "Additional arguments for bsub command"),
+    Option("qsub_args", ("--qsub-args",), "Additional arguments for qsub command"),
+    Option(
+        "exclusive", ("-e", "--exclusive"), "Exclusive node usage [default: shared]"
+    ),
+    Option(
+        "print_job_script", ("--print-job-script",), "Output job script and exit", None
+    ),
+    Option(
+        "print_versions", ("--print-versions",), "Output Cirrus versions and exit", None
+    ),
+)
+
+_FLAGS = {flag: option for option in OPTIONS for flag in option.flags}
+
+
+@cache
+def _available_options() -> tuple[Option, ...]:
+    """Options that apply to this machine, given the detected job schedulers"""
+    options = []
+    for option in OPTIONS:
+        if option.dest == "bsub_args" and not _have_bsub():
+            continue
+        if option.dest in ("qsub_args", "exclusive") and not _have_qsub():
+            continue
+        options.append(option)
+    return tuple(options)
+
+
+def _usage() -> str:
+    import textwrap  # Only needed when printing help or errors
+
+    usage = ["[-h]"]
+    for option in _available_options():
+        metavar = "" if option.type is None else f" {option.dest.upper()}"
+        usage.append(f"[{option.flags[0]}{metavar}]")
+    usage.append("input [input ...]")
+    prefix = "usage: runcirrus "
+    return (
+        textwrap.fill(
+            " ".join(usage),
+            width=80,
+            initial_indent=prefix,
+            subsequent_indent=" " * len(prefix),
+            break_on_hyphens=False,
         )
-    ap.add_argument(
-        "--print-job-script",
-        action="store_true",
-        help="Output job script and exit",
+        + "\n"
     )
-    ap.add_argument(
-        "--print-versions",
-        action=PrintVersionAction,
-        nargs=0,
-        help="Output Cirrus versions and exit",
-    )
-    return Arguments(**vars(ap.parse_args(argv[1:])))
 
 
-def run(program: str, *args: str) -> NoReturn:
-    print(f"{program} {shlex.join(args[:-1])} <SCRIPT>")
-    status = subprocess.run([program, *args])
+def _print_help() -> NoReturn:
+    lines = [
+        _usage(),
+        "positional arguments:",
+        f"  {'input':<22}Cirrus .in input file(s)",
+        "",
+        "options:",
+        f"  {'-h, --help':<22}show this help message and exit",
+    ]
+    for option in _available_options():
+        metavar = "" if option.type is None else f" {option.dest.upper()}"
+        invocation = ", ".join(f"{flag}{metavar}" for flag in option.flags)
+        if len(invocation) > 20:
+            lines.append(f"  {invocation}")
+            lines.append(f"  {'':<22}{option.help}")
+        else:
+            lines.append(f"  {invocation:<22}{option.help}")
+    lines.append("")
+    lines.append(__doc__ or "")
+    sys.stdout.write("\n".join(lines))
+    sys.exit()
+
+
+def _error(message: str) -> NoReturn:
+    sys.stderr.write(f"{_usage()}runcirrus: error: {message}\n")
+    sys.exit(2)
+
+
+def _lookup_option(flag: str) -> Option:
+    available = _available_options()
+    if (option := _FLAGS.get(flag)) is None and flag.startswith("--"):
+        # Allow unambiguous abbreviations of long options, like argparse does
+        matches = [o for o in available if any(f.startswith(flag) for f in o.flags)]
+        if len(matches) > 1:
+            _error(f"ambiguous option: {flag}")
+        if matches:
+            option = matches[0]
+    if option is None or option not in available:
+        _error(f"unrecognized arguments: {flag}")
+    return option
+
+
+def parse_args(argv: list[str]) -> Arguments:
+    values: dict[str, Any] = {
+        option.dest: False if option.type is None else option.default
+        for option in OPTIONS
+    }
+    positional: list[str] = []
+
+    # Reversed so that the next token is popped off the end
+    tokens = argv[:0:-1]
+    while tokens:
+        token = tokens.pop()
+        if token == "--":
+            positional.extend(reversed(tokens))
+            break
+        if not token.startswith("-") or token == "-":
+            positional.append(token)
+            continue
+
+        value: str | None = None
+        short = not token.startswith("--")
+        if not short and "=" in token:
+            token, value = token.split("=", 1)
+        elif short and len(token) > 2:
+            token, value = token[:2], token[2:]
+        if token in ("-h", "--help"):
+            _print_help()
+        option = _lookup_option(token)
+        name = "/".join(option.flags)
+
+        if option.type is None:
+            if value is not None and short:
+                # Clustered short flags, eg. '-iv 1.10' for '-i -v 1.10'
+                tokens.append(f"-{value}")
+            elif value is not None:
+                _error(f"argument {name}: ignored explicit argument '{value}'")
+            if option.dest == "print_versions":
+                _print_versions()
+            values[option.dest] = True
+            continue
+
+        if short and value is not None and value.startswith("="):
+            value = value[1:]
+        if value is None:
+            if not tokens:
+                _error(f"argument {name}: expected one argument")
+            value = tokens.pop()
+        try:
+            values[option.dest] = option.type(value)
+        except ValueError:
+            _error(f"argument {name}: invalid {option.type.__name__} value: '{value}'")
+
+    if not positional:
+        _error("the following arguments are required: input")
+    if values["parallel"] < 1:
+        _error("argument -P/--parallel: must be at least 1")
+    return Arguments(input=positional, **values)
+
+
+def run(program: str, *args: str, stdin: str | None = None) -> NoReturn:
+    """Run program and exit with its status
+
+    The job script is either the last argument, or if 'stdin' is given, fed to
+    the program's standard input.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        import shlex
+
+        shown_args = args if stdin is not None else args[:-1]
+        logger.debug("%s %s <SCRIPT>", program, shlex.join(shown_args))
+    status = subprocess.run([program, *args], input=stdin, text=True)
     sys.exit(status.returncode)
 
 
-def run_local(script: str, args: Arguments) -> NoReturn:
-    run(
-        "bash",
-        "-c",
-        script,
+def job_script(case_commands: str) -> str:
+    """Complete script for running a single case"""
+    return SCRIPT_HEADER + "\n" + case_commands
+
+
+def array_script(case_commands: list[str]) -> str:
+    """Combine per-case scripts into one script for a scheduler array job
+
+    The case to run is selected by the 1-based array index, which is set by
+    LSF as LSB_JOBINDEX and by PBS as PBS_ARRAY_INDEX.
+    """
+    lines = [SCRIPT_HEADER, 'case "${LSB_JOBINDEX:-$PBS_ARRAY_INDEX}" in']
+    for index, commands in enumerate(case_commands, start=1):
+        lines.extend((f"{index})", commands, ";;"))
+    lines.extend(
+        (
+            "*)",
+            'echo "Unknown array job index" >&2',
+            "exit 1",
+            ";;",
+            "esac",
+            "",
+        )
     )
+    return "\n".join(lines)
+
+
+def run_mpirun(job: Job) -> int:
+    """Run job's mpirun command, teeing its output to the .LOG and .ERR files
 
+    Returns the exit status, which like the job script's 'pipefail' is that of
+    mpirun, or of tee if mpirun succeeded. When the user-supplied arguments need
+    the shell, the job script is run with bash instead, as on the cluster.
+    """
+    if (command := mpirun_command(job)) is None:
+        script = job_script(case_script(job))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("bash -c <SCRIPT>")
+        return subprocess.run(["bash", "-c", script]).returncode
+
+    if not job.outdir.is_dir():
+        print(f"Output directory '{job.outdir}' does not exist", file=sys.stderr)
+        return 1
+
+    if logger.isEnabledFor(logging.DEBUG):
+        import shlex
+
+        logger.debug("%s", shlex.join(command))
+    with (
+        subprocess.Popen(
+            ["tee", f"{job.outdir}/{job.case}.LOG"], stdin=subprocess.PIPE
+        ) as stdout_tee,
+        subprocess.Popen(
+            ["tee", f"{job.outdir}/{job.case}.ERR"],
+            stdin=subprocess.PIPE,
+            stdout=sys.stderr.fileno(),
+        ) as stderr_tee,
+    ):
+        try:
+            status = subprocess.run(
+                command,
+                cwd=job.outdir,
+                stdout=stdout_tee.stdin,
+                stderr=stderr_tee.stdin,
+            ).returncode
+        except OSError as err:
+            print(err, file=sys.stderr)
+            status = 127
+
+    return status or stdout_tee.returncode or stderr_tee.returncode
+
+
+def run_local(job: Job, args: Arguments) -> NoReturn:
+    sys.exit(run_mpirun(job))
+
+
+def run_local_batch(jobs: list[Job], args: Arguments) -> NoReturn:
+    """Run several jobs locally, at most 'args.parallel' at a time"""
+    from concurrent.futures import ThreadPoolExecutor
 
-def run_bsub(script: str, args: Arguments, input_file: Path) -> NoReturn:
+    print(f"Running {len(jobs)} jobs, {args.parallel} at a time", flush=True)
+    with ThreadPoolExecutor(max_workers=args.parallel) as executor:
+        statuses = list(executor.map(run_mpirun, jobs))
+
+    sys.exit(next((status for status in statuses if status != 0), 0))
+
+
+def run_bsub(
+    script: str, args: Arguments, input_file: Path, num_jobs: int = 1
+) -> NoReturn:
     num_tasks = args.num_machines * args.num_tasks_per_machine
 
     resources = ["select[rhel >= 8]", "same[type:model]"]
     resources.append(f"span[ptile={args.num_tasks_per_machine}]")
     resource_string = " ".join(resources)
 
+    import shlex
+
     user_args = shlex.split(args.bsub_args or "")
 
-    script_path = input_file.parent / f"{input_file.stem}.run"
-    script_path.write_text(script, encoding="utf-8")
+    if num_jobs > 1:
+        job_name = f"Cirrus_batch[1-{num_jobs}]"
+        log_file = f"{input_file.parent}/Cirrus_batch_%I_bsub.LOG"
+    else:
+        job_name = f"Cirrus_{input_file.name}"
+        log_file = f"{input_file.parent}/{input_file.stem}_bsub.LOG"
 
     run(
         "bsub",
@@ -284,25 +661,31 @@ def run_bsub(script: str, args: Arguments, input_file: Path) -> NoReturn:
         "-n",
         str(num_tasks),
         "-o",
-        f"{input_file.parent}/{input_file.stem}_bsub.LOG",
+        log_file,
         "-J",
-        f"Cirrus_{input_file.name}",
+        job_name,
         "-R",
         resource_string,
         *user_args,
-        "--",
-        "bash",
-        str(script_path),
+        stdin=script,
     )
 
 
-def run_qsub(script: str, args: Arguments, input_file: Path) -> NoReturn:
+def run_qsub(
+    script: str, args: Arguments, input_file: Path, num_jobs: int = 1
+) -> NoReturn:
     place = "scatter:excl" if args.exclusive else "scatter:shared"
 
+    import shlex
+
     user_args = shlex.split(args.qsub_args or "")
 
-    script_path = input_file.parent / f"{input_file.stem}.run"
-    script_path.write_text(script, encoding="utf-8")
+    if num_jobs > 1:
+        job_args = ["-J", f"1-{num_jobs}", "-N", "Cirrus_batch"]
+        log_file = f"{input_file.parent}/Cirrus_batch_^array_index^_qsub.LOG"
+    else:
+        job_args = ["-N", f"Cirrus_{input_file.name}"]
+        log_file = f"{input_file.parent}/{input_file.stem}_qsub.LOG"
 
     run(
         "qsub",
@@ -315,9 +698,8 @@ def run_qsub(script: str, args: Arguments, input_file: Path) -> NoReturn:
         "-j",
         "oe",
         "-o",
-        f"{input_file.parent}/{input_file.stem}_qsub.LOG",
-        "-N",
-        f"Cirrus_{input_file.name}",
+        log_file,
+        *job_args,
         *user_args,
         "--",
         "/usr/bin/bash",
@@ -327,19 +709,21 @@ def run_qsub(script: str, args: Arguments, input_file: Path) -> NoReturn:
 
 
 def main() -> None:
-    argv = []
-    for arg in sys.argv:
-        if arg == "-nn":
-            argv.append("-m")
-        elif arg == "-nm":
-            argv.append("-n")
-        else:
-            argv.append(arg)
-
+    argv = [_ARG_REMAP.get(arg, arg) for arg in sys.argv]
     args = parse_args(argv)
-    input_file = Path(args.input).expanduser().resolve()
-    if not input_file.exists():
-        sys.exit(f"Cirrus input file '{input_file}' does not exit!")
+    input_paths = [Path(path).expanduser() for path in args.input]
+    input_files = [path.resolve() for path in input_paths]
+    for input_file in input_files:
+        if not input_file.exists():
+            sys.exit(f"Cirrus input file '{input_file}' does not exit!")
+
+    stems = [input_file.stem for input_file in input_files]
+    for stem in stems:
+        if stems.count(stem) > 1:
+            # Their .LOG, .ERR and other output files would overwrite each other
+            sys.exit(
+                f"Cirrus input files must have different names, got '{stem}' twice"
+            )
 
     if args.interactive:
         args.queue = "local"
@@ -352,7 +736,14 @@ def main() -> None:
         )
 
     if args.queue == "local":
-        args.num_tasks_per_machine = get_max_allowed_cpu(args.num_tasks_per_machine)
+        requested = args.num_tasks_per_machine
+        args.num_tasks_per_machine = get_max_allowed_cpu(requested)
+        if requested is None and len(input_files) > 1:
+            # Share the available CPUs between the jobs running at the same time
+            concurrent_jobs = min(args.parallel, len(input_files))
+            args.num_tasks_per_machine = max(
+                1, args.num_tasks_per_machine // concurrent_jobs
+            )
 
     if args.num_machines > 1 and args.queue == "local":
         sys.exit(
@@ -371,53 +762,75 @@ def main() -> None:
         sys.exit(f"Cirrus version '{version}' is not installed in {versions_path}")
 
     progname = "cirrus"
-    if version and version.split(".") < ["1", "9"]:
+    if (version_tuple := _version_tuple(version)) and version_tuple < (1, 9):
         progname = "pflotran"
 
     num_tasks = args.num_machines * args.num_tasks_per_machine
 
+    output_directory = None
     if args.output_directory:
-        outdir = Path(args.output_directory).expanduser()
-    else:
-        outdir = Path(args.input).expanduser().parent
-
-    script = SCRIPT.format(
-        root=rootdir,
-        workdir=input_file.parent,
-        input_file=input_file,
-        case=input_file.stem,
-        progname=progname,
-        mpi_args=args.mpi_args or "",
-        cirrus_args=args.cirrus_args or "",
-        num_tasks=f"-np {num_tasks}" if num_tasks is not None else "",
-        outdir=outdir.resolve(),
-        telemetry=args.telemetry,
-    )
+        output_directory = Path(args.output_directory).expanduser().resolve()
+
+    jobs = []
+    for input_path, input_file in zip(input_paths, input_files):
+        if output_directory is not None:
+            outdir = output_directory
+        elif input_path.is_symlink():
+            # Output goes next to the link, not next to the file it points to
+            outdir = input_path.parent.resolve()
+        else:
+            outdir = input_file.parent
+
+        jobs.append(
+            Job(
+                root=rootdir,
+                input_file=input_file,
+                outdir=outdir,
+                progname=progname,
+                num_tasks=num_tasks,
+                mpi_args=args.mpi_args or "",
+                cirrus_args=args.cirrus_args or "",
+                telemetry=args.telemetry,
+            )
+        )
 
-    logger.info(
-        "Start job",
-        extra={
-            "arg0": sys.argv[0],
-            "args.version": str(args.version),
-            "args.num_tasks_per_machine": args.num_tasks_per_machine,
-            "args.num_machines": args.num_machines,
-            "args.queue": args.queue,
-            "version": version,
-            "rootdir": str(rootdir),
-            "num_tasks": num_tasks,
-            "bsub": HAVE_BSUB,
-            "qsub": HAVE_QSUB,
-        },
-    )
+    if len(jobs) == 1:
+        script = job_script(case_script(jobs[0]))
+    elif args.queue == "local":
+        # Locally each case is run on its own, see run_local_batch
+        script = "\n".join(job_script(case_script(job)) for job in jobs)
+    else:
+        script = array_script([case_script(job) for job in jobs])
+
+    # Without a handler the record is dropped, so skip building it altogether
+    if logger.isEnabledFor(logging.INFO) and logger.hasHandlers():
+        logger.info(
+            "Start job",
+            extra={
+                "arg0": sys.argv[0],
+                "args.version": str(args.version),
+                "args.num_tasks_per_machine": args.num_tasks_per_machine,
+                "args.num_machines": args.num_machines,
+                "args.queue": args.queue,
+                "version": version,
+                "rootdir": str(rootdir),
+                "num_tasks": num_tasks,
+                "num_inputs": len(input_files),
+                "bsub": _have_bsub(),
+                "qsub": _have_qsub(),
+            },
+        )
 
     if args.print_job_script:
         print(script)
+    elif args.queue == "local" and len(jobs) > 1:
+        run_local_batch(jobs, args)
     elif args.queue == "local":
-        run_local(script, args)
-    elif HAVE_BSUB:
-        run_bsub(script, args, input_file)
-    elif HAVE_QSUB:
-        run_qsub(script, args, input_file)
+        run_local(jobs[0], args)
+    elif _have_bsub():
+        run_bsub(script, args, input_files[0], len(input_files))
+    elif _have_qsub():
+        run_qsub(script, args, input_files[0], len(input_files))
     else:
         sys.exit("No supported job scheduler detected on this machine")
 
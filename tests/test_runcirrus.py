@@ -6,6 +6,42 @@ from runcirrus import runcirrus
 from pathlib import Path
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    runcirrus.get_versions_path.cache_clear()
+    runcirrus._detect_schedulers.cache_clear()
+    runcirrus._available_options.cache_clear()
+    yield
+    runcirrus.get_versions_path.cache_clear()
+    runcirrus._detect_schedulers.cache_clear()
+    runcirrus._available_options.cache_clear()
+
+
+@pytest.fixture
+def print_job_script(tmp_path, capsys, monkeypatch):
+    """Run main with --print-job-script on input files below tmp_path
+
+    Input files which do not exist yet are created, and the requested Cirrus
+    version is installed as an empty directory. Returns the printed script.
+    """
+
+    def print_job_script(*inputs, args=(), version="dev"):
+        (tmp_path / "versions" / version).mkdir(parents=True, exist_ok=True)
+        monkeypatch.setenv("CIRRUS_VERSIONS_PATH", str(tmp_path / "versions"))
+        for name in inputs:
+            if not (tmp_path / name).exists():
+                (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+                (tmp_path / name).touch()
+
+        argv = ["arg0", "-v", version, "--print-job-script", *args]
+        argv += [str(tmp_path / name) for name in inputs]
+        monkeypatch.setattr(sys, "argv", argv)
+        runcirrus.main()
+        return capsys.readouterr().out
+
+    return print_job_script
+
+
 def test_printversions_empty_folder(capsys, tmp_path, monkeypatch):
     monkeypatch.setenv("CIRRUS_VERSIONS_PATH", str(tmp_path))
     with pytest.raises(SystemExit):
@@ -28,6 +64,56 @@ def test_printversions_ignore_hidden(dirs, expected_out, capsys, tmp_path, monke
     assert capsys.readouterr().out == expected_out
 
 
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["-q", "bigmem", "-n", "8", "-m", "2", "spe1.in"],
+        ["--queue=bigmem", "-n8", "--num-machines", "2", "spe1.in"],
+        ["spe1.in", "--num-tasks=8", "-m2", "-q", "bigmem"],
+        ["-n=8", "-m=2", "-qbigmem", "spe1.in"],
+        ["-q", "bigmem", "-m", "2", "-in", "8", "spe1.in"],
+    ],
+)
+def test_parse_args(argv):
+    args = runcirrus.parse_args(["0", *argv])
+
+    assert args.input == ["spe1.in"]
+    assert args.queue == "bigmem"
+    assert args.num_tasks_per_machine == 8
+    assert args.num_machines == 2
+    assert args.interactive is ("-in" in argv)
+
+
+@pytest.mark.parametrize(
+    "flags",
+    [["-iv", "1.10"], ["-iv1.10"], ["-i", "-v=1.10"], ["--interactive", "-v", "1.10"]],
+)
+def test_parse_args_clustered_short_flags(flags):
+    args = runcirrus.parse_args(["0", *flags, "spe1.in"])
+
+    assert args.interactive is True
+    assert args.version == "1.10"
+
+
+@pytest.mark.parametrize(
+    "argv,message",
+    [
+        ([], "the following arguments are required: input"),
+        (["-n", "eight", "spe1.in"], "invalid int value: 'eight'"),
+        (["spe1.in", "-q"], "argument -q/--queue: expected one argument"),
+        (["--no-such-option", "spe1.in"], "unrecognized arguments: --no-such-option"),
+        (["--print", "spe1.in"], "ambiguous option: --print"),
+        (["-P", "0", "spe1.in"], "argument -P/--parallel: must be at least 1"),
+    ],
+)
+def test_parse_args_errors(argv, message, capsys):
+    with pytest.raises(SystemExit) as exc:
+        runcirrus.parse_args(["0", *argv])
+
+    assert exc.value.code == 2
+    assert message in capsys.readouterr().err
+
+
 @pytest.mark.parametrize(
     "script_name,expect",
     [
@@ -41,6 +127,22 @@ def test_default_version(script_name, expect):
     assert runcirrus.default_version(script_name) == expect, f"{script_name=}"
 
 
+@pytest.mark.parametrize(
+    "version,expect",
+    [
+        ("1.8", (1, 8)),
+        ("1.8.12", (1, 8, 12)),
+        ("1.10", (1, 10)),
+        ("1.8-openpbs", (1, 8)),
+        ("1.10-openpbs", (1, 10)),
+        ("1.10rc1", (1, 10)),
+        ("stable", ()),
+    ],
+)
+def test_version_tuple(version, expect):
+    assert runcirrus._version_tuple(version) == expect
+
+
 @pytest.mark.parametrize(
     "dir,expected_out",
     [
@@ -94,6 +196,30 @@ def test_get_versions_path_correctly_fails(capsys, monkeypatch):
     assert err.match("Not able to locate install location from /some/example/path")
 
 
+@pytest.mark.parametrize(
+    "programs,expected",
+    [
+        ({}, (False, False)),
+        ({"a": ["bsub"]}, (True, False)),
+        ({"a": ["qsub"], "b": ["bsub"]}, (True, True)),
+        ({"a": ["bsub", "qsub"]}, (True, True)),
+    ],
+)
+def test_detect_schedulers(programs, expected, tmp_path, monkeypatch):
+    for directory, names in programs.items():
+        (tmp_path / directory).mkdir()
+        for name in names:
+            (tmp_path / directory / name).touch(mode=0o755)
+    # A non-executable file must not count as an available scheduler
+    (tmp_path / "noexec").mkdir()
+    (tmp_path / "noexec/qsub").touch(mode=0o644)
+
+    path = [str(tmp_path / "noexec"), *(str(tmp_path / d) for d in programs)]
+    monkeypatch.setenv("PATH", os.pathsep.join(path))
+
+    assert runcirrus._detect_schedulers() == expected
+
+
 def test_get_max_allowed_cpu_with_no_hostfile_defined(monkeypatch):
     monkeypatch.setattr(os, "cpu_count", lambda: 1337)
 
@@ -156,3 +282,268 @@ def test_num_cpu_precedence_is_correct(
 
     # Don't let the user-specified '-n' flag be greater than the limit set by hostfile
     assert run_local.call_args[0][1].num_tasks_per_machine == expected_cpu
+
+
+def test_run_bsub_submits_script_on_stdin(tmp_path, mocker, monkeypatch):
+    input_file = tmp_path / "spe1.in"
+    input_file.touch()
+    subprocess_run = mocker.Mock(return_value=mocker.Mock(returncode=0))
+    monkeypatch.setattr(runcirrus.subprocess, "run", subprocess_run)
+    args = runcirrus.parse_args(["0", "-q", "bigmem", "-n", "8", str(input_file)])
+
+    with pytest.raises(SystemExit):
+        runcirrus.run_bsub("SCRIPT", args, input_file)
+
+    command = subprocess_run.call_args[0][0]
+    assert command[0] == "bsub"
+    assert "Cirrus_spe1.in" in command
+    assert subprocess_run.call_args[1]["input"] == "SCRIPT"
+    assert not (tmp_path / "spe1.run").exists()
+
+
+def test_print_job_script_for_multiple_inputs(print_job_script):
+    script = print_job_script("spe1.in", "spe2.in", args=["-q", "bigmem", "-n", "1"])
+
+    assert script.startswith(runcirrus.SCRIPT_HEADER)
+    assert 'case "${LSB_JOBINDEX:-$PBS_ARRAY_INDEX}" in' in script
+    assert script.index("1)") < script.index("spe1.in") < script.index("2)")
+    assert script.index("2)") < script.index("spe2.in")
+
+
+def test_print_job_script_for_multiple_local_inputs(print_job_script):
+    script = print_job_script("spe1.in", "spe2.in")
+
+    assert script.count(runcirrus.SCRIPT_HEADER) == 2
+    assert "LSB_JOBINDEX" not in script
+    assert script.index("spe1.in") < script.index("spe2.in")
+
+
+@pytest.mark.parametrize(
+    "inputs,args",
+    [
+        (["a/spe1.in", "b/spe1.in"], []),
+        (["a/spe1.in", "b/spe1.in"], ["-o", "out"]),
+        (["spe1.in", "spe1.in"], []),
+    ],
+)
+def test_duplicate_input_names_are_rejected(inputs, args, print_job_script):
+    with pytest.raises(SystemExit) as exc:
+        print_job_script(*inputs, args=args)
+
+    assert exc.value.code == (
+        "Cirrus input files must have different names, got 'spe1' twice"
+    )
+
+
+def test_run_bsub_submits_array_job(tmp_path, mocker, monkeypatch):
+    input_file = tmp_path / "spe1.in"
+    subprocess_run = mocker.Mock(return_value=mocker.Mock(returncode=0))
+    monkeypatch.setattr(runcirrus.subprocess, "run", subprocess_run)
+    args = runcirrus.parse_args(["0", "-q", "bigmem", "-n", "8", str(input_file)])
+
+    with pytest.raises(SystemExit):
+        runcirrus.run_bsub("SCRIPT", args, input_file, num_jobs=3)
+
+    assert "Cirrus_batch[1-3]" in subprocess_run.call_args[0][0]
+
+
+@pytest.mark.parametrize("symlinked", [False, True])
+def test_output_directory_defaults_to_input_location(
+    symlinked, tmp_path, print_job_script
+):
+    input_file = tmp_path / "cases/spe1.in"
+    input_file.parent.mkdir()
+    input_file.touch()
+    if symlinked:
+        (tmp_path / "links").mkdir()
+        input_file = tmp_path / "links/spe1.in"
+        input_file.symlink_to(tmp_path / "cases/spe1.in")
+
+    script = print_job_script(input_file.relative_to(tmp_path))
+
+    assert f'cd "{input_file.parent.resolve()}"\n' in script
+
+
+@pytest.mark.parametrize(
+    "version,progname",
+    [
+        ("1.8", "pflotran"),
+        ("1.8.12", "pflotran"),
+        ("1.9", "cirrus"),
+        ("1.10", "cirrus"),
+        ("1.10-openpbs", "cirrus"),
+        ("1.8-openpbs", "pflotran"),
+    ],
+)
+def test_progname_depends_on_version(version, progname, print_job_script):
+    script = print_job_script("spe1.in", version=version)
+
+    assert f"/bin/{progname} " in script
+
+
+@pytest.mark.parametrize("rdma_module_loaded", [False, True])
+def test_mpirun_command(rdma_module_loaded, monkeypatch):
+    modules = (
+        "bnxt_re 229376 0 - Live 0x0000000000000000\n" if rdma_module_loaded else ""
+    )
+    monkeypatch.setattr(runcirrus, "_read_text", lambda _: modules)
+    monkeypatch.setenv("LSB_MCPU_HOSTS", "host0 2")
+    monkeypatch.setenv("LSB_DJOB_RANKFILE", "/tmp/rankfile")
+    job = runcirrus.Job(
+        root=Path("/prog/cirrus/versions/1.10"),
+        input_file=Path("/cases/spe1.in"),
+        outdir=Path("/out"),
+        progname="cirrus",
+        num_tasks=4,
+        mpi_args="-x 'A B'",
+        cirrus_args="",
+        telemetry="",
+    )
+
+    transport = ["-mca", "btl", "vader,self,tcp", "-mca", "pml", "^ucx"]
+    assert runcirrus.mpirun_command(job) == [
+        "/prog/cirrus/versions/1.10/bin/mpirun",
+        *(transport if rdma_module_loaded else []),
+        "-machinefile",
+        "/tmp/rankfile",
+        "-np",
+        "4",
+        "-x",
+        "A B",
+        "/prog/cirrus/versions/1.10/bin/cirrus",
+        "-cirrusin",
+        "/cases/spe1.in",
+        "-output_prefix",
+        "/out/spe1",
+    ]
+
+
+def test_run_logs_command_at_debug_level(caplog, mocker, monkeypatch):
+    monkeypatch.setattr(
+        runcirrus.subprocess, "run", mocker.Mock(return_value=mocker.Mock(returncode=0))
+    )
+
+    with pytest.raises(SystemExit):
+        runcirrus.run("bash", "-c", "SCRIPT")
+    assert not caplog.records
+
+    caplog.set_level("DEBUG", logger="runcirrus")
+    with pytest.raises(SystemExit):
+        runcirrus.run("bsub", "-J", "Cirrus spe1.in", stdin="SCRIPT")
+    assert caplog.messages == ["bsub -J 'Cirrus spe1.in' <SCRIPT>"]
+
+
+def test_mpirun_command_without_lsf_rankfile(monkeypatch):
+    monkeypatch.setattr(runcirrus, "_read_text", lambda _: "")
+    monkeypatch.setenv("LSB_MCPU_HOSTS", "host0 2")
+    monkeypatch.delenv("LSB_DJOB_RANKFILE", raising=False)
+    job = runcirrus.Job(
+        root=Path("/root"),
+        input_file=Path("/cases/spe1.in"),
+        outdir=Path("/out"),
+        progname="cirrus",
+        num_tasks=1,
+        mpi_args="",
+        cirrus_args="",
+        telemetry="",
+    )
+
+    assert "-machinefile" not in runcirrus.mpirun_command(job)
+
+
+@pytest.mark.parametrize(
+    "mpi_args",
+    [
+        "-x HOME=$HOME",
+        "-x ${HOME}",
+        "-x DATA=~/x.h5",
+        "-x HOST=$(hostname)",
+        "-x UID=`id -u`",
+        "-x A\\ B",
+        "-x 'A",
+        "-x A; true",
+        "-x *.h5",
+    ],
+)
+def test_mpirun_command_leaves_shell_syntax_to_bash(mpi_args):
+    job = runcirrus.Job(
+        root=Path("/root"),
+        input_file=Path("/cases/spe1.in"),
+        outdir=Path("/out"),
+        progname="cirrus",
+        num_tasks=1,
+        mpi_args=mpi_args,
+        cirrus_args="",
+        telemetry="",
+    )
+
+    assert runcirrus.mpirun_command(job) is None
+
+
+def test_print_job_script_keeps_shell_syntax(print_job_script):
+    mpi_args = "-x HOST=$(hostname) -x UID=`id -u` -x DATA=~/x.h5"
+
+    script = print_job_script("spe1.in", args=["--mpi-args", mpi_args])
+
+    assert f" {mpi_args} " in script
+
+
+@pytest.fixture
+def fake_job(tmp_path, monkeypatch):
+    """Job whose mpirun is a shell script printing its working directory"""
+    monkeypatch.setattr(runcirrus, "_read_text", lambda _: "")
+    for env in ("LSB_MCPU_HOSTS", "PBS_NODEFILE"):
+        monkeypatch.delenv(env, raising=False)
+    mpirun = tmp_path / "versions/dev/bin/mpirun"
+    mpirun.parent.mkdir(parents=True)
+    mpirun.write_text('#!/bin/sh\necho "stdout from $PWD"\necho "stderr" >&2\nexit 3\n')
+    mpirun.chmod(0o755)
+    (tmp_path / "out").mkdir()
+
+    return runcirrus.Job(
+        root=tmp_path / "versions/dev",
+        input_file=tmp_path / "spe1.in",
+        outdir=tmp_path / "out",
+        progname="cirrus",
+        num_tasks=1,
+        mpi_args="",
+        cirrus_args="",
+        telemetry="",
+    )
+
+
+def test_run_mpirun_tees_output_and_returns_mpirun_status(fake_job, capfd):
+    assert runcirrus.run_mpirun(fake_job) == 3
+
+    outdir = fake_job.outdir
+    assert (outdir / "spe1.LOG").read_text() == f"stdout from {outdir}\n"
+    assert (outdir / "spe1.ERR").read_text() == "stderr\n"
+    captured = capfd.readouterr()
+    assert captured.out == f"stdout from {outdir}\n"
+    assert captured.err == "stderr\n"
+
+
+def test_run_mpirun_fails_for_missing_output_directory(fake_job, tmp_path):
+    fake_job.outdir = tmp_path / "does-not-exist"
+
+    assert runcirrus.run_mpirun(fake_job) == 1
+
+
+def test_run_mpirun_fails_for_missing_mpirun(fake_job, tmp_path):
+    fake_job.root = tmp_path / "versions/not-installed"
+
+    assert runcirrus.run_mpirun(fake_job) == 127
+    assert (fake_job.outdir / "spe1.LOG").read_text() == ""
+
+
+def test_run_mpirun_expands_shell_syntax_like_the_job_script(
+    fake_job, tmp_path, monkeypatch
+):
+    (fake_job.root / "bin/mpirun").write_text('#!/bin/sh\necho "$*"\n')
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    fake_job.mpi_args = "-x DATA=~/x.h5 -x OUT=$PWD"
+
+    assert runcirrus.run_mpirun(fake_job) == 0
+
+    log = (fake_job.outdir / "spe1.LOG").read_text()
+    assert f" -x DATA={tmp_path}/home/x.h5 -x OUT={fake_job.outdir} " in log